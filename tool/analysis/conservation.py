@@ -3,7 +3,7 @@ import RNA
 from pathlib import Path
 from tool.config import Config
 from tool.core.sequence_analysis import SequenceAnalyzer
-from tool.utils.parallel import ParallelProcessor
+from tool.utils import bitpack
 
 class ConservationAnalyzer:
     """Analyzes nucleotide conservation through mutation tolerance"""
@@ -30,61 +30,101 @@ class ConservationAnalyzer:
     def _run_analysis(self, attempts_per_pos):
         """Core analysis workflow"""
         L = len(self.seq)
-        mut_attempts = np.zeros((L, 3), dtype=float)  # 3 possible mutations per position
-        mut_accepts = np.zeros((L, 3), dtype=float)
+        mut_attempts = np.full((L, 3), attempts_per_pos, dtype=int)  # 3 possible mutations per position
+        mut_accepts = np.zeros((L, 3), dtype=int)
         
-        # Parallelize position analysis
-        results = ParallelProcessor.parallel_map(self._analyze_position, range(L))
+        # Build all 3L point mutants up front, as (position, alternative index, base)
+        mutations = [(pos, j, alt_base)
+                     for pos in range(L)
+                     for j, alt_base in enumerate(b for b in self.BASES if b != self.seq[pos])]
         
-        # Aggregate results
-        for pos, (pos_attempts, pos_accepts) in enumerate(results):
-            mut_attempts[pos] = pos_attempts
-            mut_accepts[pos] = pos_accepts
+        # Cheap sequence filters run on the 2-bit packed mutants, and mutants
+        # that break a base pair of the reference structure can never fold
+        # back into it, so only the remaining ones go further
+        ref_packed = bitpack.pack(self.seq)
+        partners = self._pair_partners()
+        candidates = [(pos, j, alt_base) for pos, j, alt_base in mutations
+                      if _passes_sequence_filters(bitpack.substitute(ref_packed, pos, alt_base), L)
+                      and (partners[pos] < 0 or _is_canonical_pair(alt_base, self.seq[partners[pos]]))]
+        
+        if candidates:
+            positions, alt_indices, alt_bases = zip(*candidates)
+            sequences = self._create_variants(zip(positions, alt_bases))
+            
+            # A mutant that folds into the reference structure has exactly the
+            # energy of that structure, so evaluating it (linear time) rules
+            # out mutants whose MFE could not be within tolerance without a
+            # full fold. Skipped for LinearFold, whose energies may differ.
+            if not SequenceAnalyzer.uses_linearfold(L):
+                keep = [i for i, seq in enumerate(sequences)
+                        if abs(SequenceAnalyzer.evaluate_structure(seq, self.struct) - self.mfe) <= Config.MFE_TOLERANCE]
+                positions = [positions[i] for i in keep]
+                alt_indices = [alt_indices[i] for i in keep]
+                sequences = [sequences[i] for i in keep]
+            
+            valid = [self._matches_reference(struct, mfe) for struct, mfe in SequenceAnalyzer.fold_many(sequences)]
+            
+            # Scatter results back into the (L, 3) count matrix
+            mut_accepts[list(positions), list(alt_indices)] = np.where(valid, attempts_per_pos, 0)
             
         return self._calculate_scores(mut_attempts, mut_accepts)
     
-    def _analyze_position(self, pos):
-        """Analyze single position (runs in parallel)"""
-        ref_base = self.seq[pos]
-        alternatives = [b for b in self.BASES if b != ref_base]
-        pos_attempts = np.zeros(3)
-        pos_accepts = np.zeros(3)
-        
-        for j, alt_base in enumerate(alternatives):
-            for _ in range(Config.CONSERVATION_ATTEMPTS):
-                variant = self._create_variant(pos, alt_base)
-                pos_attempts[j] += 1
-                if self._is_valid_variant(variant):
-                    pos_accepts[j] += 1
-                    
-        return pos_attempts, pos_accepts
+    def _pair_partners(self):
+        """0-based pairing partner of each position in the reference structure (-1 if unpaired)"""
+        pt = RNA.ptable(self.struct)
+        return [pt[i] - 1 for i in range(1, len(pt))]
     
-    def _create_variant(self, pos, alt_base):
-        """Generate single-point mutant"""
-        return self.seq[:pos] + alt_base + self.seq[pos+1:]
+    def _create_variants(self, mutations):
+        """Generate single-point mutants from (pos, alt_base) pairs, reusing one buffer"""
+        buf = bytearray(self.seq, 'ascii')
+        variants = []
+        for pos, alt_base in mutations:
+            buf[pos] = ord(alt_base)
+            variants.append(buf.decode('ascii'))
+            buf[pos] = ord(self.seq[pos])
+        return variants
     
-    def _is_valid_variant(self, variant):
-        """Check if variant meets all criteria"""
-        struct, mfe = SequenceAnalyzer.run_rnafold(variant)
-        return (struct == self.struct and
-                passes_gc_filter(variant) and
-                abs(mfe - self.mfe) <= Config.MFE_TOLERANCE and
-                not SequenceAnalyzer.has_homopolymer(variant))
+    def _matches_reference(self, struct, mfe):
+        """Check a folded variant's structure and MFE against the reference"""
+        return struct == self.struct and abs(mfe - self.mfe) <= Config.MFE_TOLERANCE
     
     def _calculate_scores(self, attempts, accepts):
         """Convert raw counts to conservation scores"""
         tolerance_matrix = np.divide(
             accepts, attempts,
-            out=np.zeros_like(attempts),
+            out=np.zeros(attempts.shape),
             where=attempts != 0
         )
+        # Attempts are uniform across the 3 alternatives, so the row-wise
+        # mean tolerance equals total accepts over total attempts
+        total_attempts = attempts.sum(axis=1, dtype=np.uint32)
+        total_accepts = accepts.sum(axis=1, dtype=np.uint32)
+        tolerance = np.divide(
+            total_accepts, total_attempts,
+            out=np.zeros(len(attempts)),
+            where=total_attempts != 0
+        )
         return {
-            'conservation': 1 - np.mean(tolerance_matrix, axis=1),
+            'conservation': 1 - tolerance,
             'tolerance_matrix': tolerance_matrix,
             'attempts': attempts,
             'accepts': accepts
         }
 
+_CANONICAL_PAIRS = {'AU', 'UA', 'GC', 'CG', 'GU', 'UG'}
+
+def _is_canonical_pair(base1, base2):
+    """Check if two bases can form a Watson-Crick or GU wobble pair"""
+    return (base1 + base2).replace('T', 'U') in _CANONICAL_PAIRS
+
+# GC content bounds (fractions) for mutants considered in the analysis
+_MIN_GC, _MAX_GC = 0.3, 0.7
+
+def _passes_sequence_filters(packed, length, min_gc=_MIN_GC, max_gc=_MAX_GC):
+    """GC content and homopolymer checks on a 2-bit packed sequence"""
+    gc_content = bitpack.gc_count(packed, length) / length
+    return min_gc <= gc_content <= max_gc and not bitpack.has_homopolymer(packed, length)
+
 # Helper functions (from original script)
 def mutation_tolerance_analysis(seq, attempts=100):
     """Legacy interface from your original script"""
@@ -95,7 +135,7 @@ def mutation_tolerance_analysis(seq, attempts=100):
             results['attempts'], 
             results['accepts'])
 
-def passes_gc_filter(seq, min_gc=0.3, max_gc=0.7):
+def passes_gc_filter(seq, min_gc=_MIN_GC, max_gc=_MAX_GC):
     """Checks if the GC content of the sequence is within the allowed range."""
     gc_count = seq.count('G') + seq.count('C')
     gc_content = gc_count / len(seq)
@@ -37,6 +37,12 @@ class Config:
     # --- Parallelization ---
     NUM_CORES = max(1, cpu_count() - 1)                  # Number of CPU cores to use
 
+    # --- Folding Backend ---
+    USE_LINEARFOLD = True                                # Fold long sequences with LinearFold when it is installed
+    LINEARFOLD_BINARY = "linearfold"                     # LinearFold executable used for long sequences
+    LINEARFOLD_THRESHOLD = 150                           # Length above which sequences are folded with LinearFold
+    ENERGY_PARAMETER_FILE = None                         # ViennaRNA energy parameter file (None = Turner 2004 defaults)
+
     # --- Generation Method Control ---
     GENERATION_METHOD = "auto"                           # "auto" | "inverse" | "conservation"
     AUTO_SWITCH_LENGTH = 30                              # Length threshold for auto mode (≤ uses conservation-guided)
@@ -136,6 +142,12 @@ Parameter Overview:
 - Parallelization:
     NUM_CORES: Number of CPU cores to use for parallel tasks.
 
+- Folding Backend:
+    USE_LINEARFOLD: Fold sequences longer than LINEARFOLD_THRESHOLD with LinearFold instead of RNAfold.
+    LINEARFOLD_BINARY: LinearFold executable (linear-time folding, ViennaRNA energy model).
+    LINEARFOLD_THRESHOLD: Sequence length above which LinearFold is used.
+    ENERGY_PARAMETER_FILE: Optional ViennaRNA parameter file, loaded once per process (fold caches are kept per file).
+
 - Generation Method Control:
     GENERATION_METHOD: "auto" (hybrid), "inverse", or "conservation".
     AUTO_SWITCH_LENGTH: Length threshold for auto mode. (Recommended ≤ 30)
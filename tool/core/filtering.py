@@ -1,32 +1,68 @@
+import numpy as np
 from tool.core.sequence_analysis import SequenceAnalyzer
 from tool.config import Config
-from tool.utils.parallel import ParallelProcessor
+from tool.utils.suffix_automaton import SuffixAutomaton
 
 class VariantFilter:
     @staticmethod
     def filter_variants(variants, wt_seq, wt_struct):
-        results = ParallelProcessor.parallel_map(SequenceAnalyzer.run_rnafold, variants)
+        # Scores are kept in arrays indexed like variants
+        n = len(variants)
+        mfes = np.zeros(n)
+        probs = np.zeros(n)
+        keep = np.zeros(n, dtype=bool)
 
-        variant_info = []
-        for seq, (struct, mfe) in zip(variants, results):
-            if struct != wt_struct or not (Config.GC_CONTENT_RANGE[0] <= SequenceAnalyzer.gc_content(seq) <= Config.GC_CONTENT_RANGE[1]) or SequenceAnalyzer.has_homopolymer(seq):
-                continue
-            
-            prob, diversity = SequenceAnalyzer.structure_confidence(seq, wt_struct)
-            if prob < Config.MIN_STRUCTURE_PROB or diversity > Config.MAX_STRUCTURE_DIVERSITY: 
+        # Cheapest checks first. Only variants of the structure's length can
+        # fold into it, and they share one encoded array for the GC and
+        # homopolymer checks, so nothing is folded that would fail those.
+        sized = [i for i, seq in enumerate(variants) if len(seq) == len(wt_struct)]
+        codes = SequenceAnalyzer.encode_sequences([variants[i] for i in sized])
+        gc = SequenceAnalyzer.gc_content_batch(codes)
+        passes = ((Config.GC_CONTENT_RANGE[0] <= gc) & (gc <= Config.GC_CONTENT_RANGE[1])
+                  & ~SequenceAnalyzer.has_homopolymer_batch(codes))
+        prefiltered = [i for i, ok in zip(sized, passes) if ok]
+
+        results = SequenceAnalyzer.fold_many([variants[i] for i in prefiltered])
+
+        # enforce_lmax_filter always compares against the wild type, so a
+        # variant sharing too long a substring with it can never be kept and
+        # needs no partition function
+        wt_index = SuffixAutomaton()
+        wt_index.extend(wt_seq)
+
+        candidates = []
+        for i, (struct, mfe) in zip(prefiltered, results):
+            if struct != wt_struct or wt_index.max_match(variants[i]) > Config.LMAX_THRESHOLD:
                 continue
+            candidates.append(i)
+            mfes[i] = mfe
 
-            variant_info.append((seq, mfe, prob, diversity))
+        confidences = SequenceAnalyzer.structure_confidence_batch([variants[i] for i in candidates], wt_struct)
+        for i, (prob, diversity) in zip(candidates, confidences):
+            probs[i] = prob
+            keep[i] = prob >= Config.MIN_STRUCTURE_PROB and diversity <= Config.MAX_STRUCTURE_DIVERSITY
 
-        variant_info.sort(key=lambda x: (-x[2], x[1]))
-        top_variants = [seq for seq, _, _, _ in variant_info[:Config.TARGET_VARIANT_COUNT]]
+        # Rank by probability (descending), then MFE, keeping input order on
+        # ties. Only variants at least as probable as the K-th best can make
+        # the cut, so the full sort is limited to those.
+        k = Config.TARGET_VARIANT_COUNT
+        idx = np.flatnonzero(keep)
+        if len(idx) > k > 0:
+            kth = np.partition(-probs[idx], k - 1)[k - 1]
+            idx = idx[-probs[idx] <= kth]
+        order = idx[np.lexsort((mfes[idx], -probs[idx]))][:k]
+        top_variants = [variants[i] for i in order]
         return top_variants
 
     @staticmethod
     def enforce_lmax_filter(variants, wt_seq, threshold=Config.LMAX_THRESHOLD):
+        # The automaton holds the wild type and every accepted variant, so each
+        # candidate's Lmax against all of them comes from a single scan
+        accepted = SuffixAutomaton()
+        accepted.extend(wt_seq)
         passed = []
         for candidate in variants:
-            max_lmax = max(SequenceAnalyzer.longest_common_substring(candidate, seq) for seq in passed + [wt_seq])
-            if max_lmax <= threshold:
+            if accepted.max_match(candidate) <= threshold:
                 passed.append(candidate)
+                accepted.extend(candidate)
         return passed
\ No newline at end of file
@@ -1,47 +1,49 @@
 import numpy as np
-import random
-from sklearn.metrics import pairwise_distances
-from sklearn.cluster import KMeans
+from sklearn.metrics.pairwise import euclidean_distances
+from sklearn.cluster import MiniBatchKMeans
 from sklearn.feature_extraction.text import CountVectorizer
 from tool.core.sequence_analysis import SequenceAnalyzer
 from tool.config import Config
 
 class GroupGenerator:
     @staticmethod
-    def generate_diverse_groups(variants, group_size, n_groups, wt_seq):
-        seq_arrays = [[ord(c) for c in seq] for seq in variants]
-        dist_matrix = pairwise_distances(seq_arrays, metric='hamming') * len(variants[0])
+    def generate_diverse_groups(variants, group_size, n_groups, wt_seq, dist_matrix=None):
+        # Callers that also need the Hamming matrix can compute it once and pass it in
+        if dist_matrix is None:
+            dist_matrix = SequenceAnalyzer.hamming_matrix(variants)
 
-        selected_indices = set()
+        # Hamming distance of every variant to the wild type, computed once
+        encoded = SequenceAnalyzer.encode_sequences(variants)
+        wt_encoded = SequenceAnalyzer.encode_sequences([wt_seq.replace("T", "U")])[0]
+        dists_to_wt = (encoded != wt_encoded).sum(axis=1)
+
+        selected = np.zeros(len(variants), dtype=bool)
+        n_selected = 0
         groups = []
 
         for _ in range(n_groups):
-            group = []
-            available = list(set(range(len(variants))) - selected_indices)
-            if not available:
+            if n_selected == len(variants):
                 break
 
-            if not group:
-                wt_array = [ord(c) for c in wt_seq.replace("T", "U")]
-                dists_to_wt = [np.sum(np.array(seq) != np.array(wt_array)) for seq in seq_arrays]
-                first = max(available, key=lambda i: dists_to_wt[i])
-            else:
-                first = random.choice(available)
-            
-            group.append(first)
-            selected_indices.add(first)
+            # Each group starts from the available variant farthest from the wild type
+            first = int(np.argmax(np.where(selected, -1, dists_to_wt)))
+            group = [first]
+            selected[first] = True
+            n_selected += 1
 
-            while len(group) < group_size and len(selected_indices) < len(variants):
-                remaining = list(set(range(len(variants))) - selected_indices)
-                scores = []
+            # Distance from every variant to its nearest group member,
+            # with already selected variants masked out
+            min_dist = dist_matrix[first].copy()
+            min_dist[selected] = -1
 
-                for idx in remaining:
-                    min_dist = min(dist_matrix[idx][g] for g in group)
-                    scores.append((min_dist, idx))
-                
-                _, best_idx = max(scores)
+            while len(group) < group_size and n_selected < len(variants):
+                # Ties go to the highest index, as with max() over (dist, idx)
+                best_idx = len(variants) - 1 - int(np.argmax(min_dist[::-1]))
                 group.append(best_idx)
-                selected_indices.add(best_idx)
+                selected[best_idx] = True
+                n_selected += 1
+                np.minimum(min_dist, dist_matrix[best_idx], out=min_dist)
+                min_dist[best_idx] = -1
             
             groups.append([variants[i] for i in group])
 
@@ -59,32 +61,23 @@ class GroupGenerator:
             return GroupGenerator.cluster_based_selection(variants, n)
 
     @staticmethod
-    def distance_based_selection(variants, n):
-        seq_arrays = [[ord(c) for c in seq] for seq in variants]
-        dist_matrix = pairwise_distances(seq_arrays, metric='hamming') * len(variants[0])
+    def distance_based_selection(variants, n, dist_matrix=None):
+        if dist_matrix is None:
+            dist_matrix = SequenceAnalyzer.hamming_matrix(variants)
         
-        selected = []
-        remaining_indices = set(range(len(variants)))
+        first = int(np.argmax(dist_matrix.sum(axis=1)))
+        selected = [first]
         
-        first = max(remaining_indices, key=lambda i: np.sum(dist_matrix[i]))
-        selected.append(first)
-        remaining_indices.remove(first)
+        # Distance from every variant to its nearest selected variant
+        # (distances are non-negative, so -1 marks selected variants)
+        min_dist = dist_matrix[first].copy()
+        min_dist[first] = -1
         
-        while len(selected) < n and remaining_indices:
-            best_score = -1
-            best_idx = -1
-            
-            for idx in remaining_indices:
-                min_dist = min(dist_matrix[idx][s] for s in selected)
-                if min_dist > best_score:
-                    best_score = min_dist
-                    best_idx = idx
-                    
-            if best_idx == -1:
-                break
-                
+        while len(selected) < min(n, len(variants)):
+            best_idx = int(np.argmax(min_dist))
             selected.append(best_idx)
-            remaining_indices.remove(best_idx)
+            np.minimum(min_dist, dist_matrix[best_idx], out=min_dist)
+            min_dist[best_idx] = -1
         
         return [variants[i] for i in selected]
 
@@ -93,15 +86,19 @@ class GroupGenerator:
         vectorizer = CountVectorizer(analyzer='char', ngram_range=(1,3))
         X = vectorizer.fit_transform(variants)
         
-        kmeans = KMeans(n_clusters=n, random_state=Config.RANDOM_SEED)
+        kmeans = MiniBatchKMeans(
+            n_clusters=n,
+            batch_size=min(1024, len(variants)),
+            n_init=3,
+            random_state=Config.RANDOM_SEED
+        )
         clusters = kmeans.fit_predict(X)
         
-        selected = []
-        for cluster_id in range(n):
-            cluster_indices = np.where(clusters == cluster_id)[0]
-            if len(cluster_indices) > 0:
-                center = kmeans.cluster_centers_[cluster_id]
-                distances = np.linalg.norm(X[cluster_indices].toarray() - center, axis=1)
-                selected.append(variants[cluster_indices[np.argmin(distances)]])
+        # Distance of each variant to its own cluster center, computed on the
+        # sparse matrix without densifying it
+        distances = euclidean_distances(X, kmeans.cluster_centers_)[np.arange(X.shape[0]), clusters]
         
-        return selected
\ No newline at end of file
+        # Order by (cluster, distance) and keep the first variant of each cluster
+        order = np.lexsort((distances, clusters))
+        is_nearest = np.r_[True, clusters[order][1:] != clusters[order][:-1]]
+        return [variants[i] for i in order[is_nearest]]
\ No newline at end of file
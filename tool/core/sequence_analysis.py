@@ -1,60 +1,274 @@
 import logging
-from typing import Tuple, Optional
+import shutil
+import subprocess
+from typing import List, Tuple, Optional
 import RNA
 import numpy as np
-from functools import lru_cache
+from functools import lru_cache, partial
+from tool.config import Config
 from tool.utils.caching import CacheManager
+from tool.utils.parallel import ParallelProcessor
+from tool.utils import bitpack, kernels
 
 logger = logging.getLogger(__name__)
 cache_manager = CacheManager()
 
+# Rows per block when broadcasting pairwise comparisons, bounding the
+# (block, n, L) temporary
+PAIRWISE_BLOCK_ROWS = 256
+
 class SequenceAnalyzer:
     """Static class for RNA sequence analysis operations."""
     
     @staticmethod
-    @lru_cache(maxsize=100000)
+    @lru_cache(maxsize=1)
+    def fold_model() -> RNA.md:
+        """Model details shared by every fold in this process.
+        
+        Built on first use, after loading Config.ENERGY_PARAMETER_FILE if one
+        is set, so parameters are read once per process rather than per fold.
+        
+        Returns:
+            ViennaRNA model details object
+        """
+        if Config.ENERGY_PARAMETER_FILE:
+            RNA.read_parameter_file(Config.ENERGY_PARAMETER_FILE)
+        return RNA.md()
+
+    @staticmethod
+    def uses_linearfold(length: int) -> bool:
+        """Check whether sequences of a given length are folded with LinearFold.
+        
+        Args:
+            length: Sequence length
+            
+        Returns:
+            True if USE_LINEARFOLD is set, the length exceeds
+            LINEARFOLD_THRESHOLD and the LinearFold executable is available
+        """
+        return Config.USE_LINEARFOLD and length > Config.LINEARFOLD_THRESHOLD and _linearfold_available()
+
+    @staticmethod
     def run_rnafold(sequence: str) -> Tuple[str, float]:
         """Run RNAfold to get secondary structure and MFE.
         
+        Sequences for which uses_linearfold holds are handed to
+        run_linearfold instead. Its approximate results are not written to
+        the RNAfold cache.
+        
         Args:
             sequence: RNA sequence string
             
         Returns:
             Tuple of (structure, mfe) where structure is dot-bracket notation
         """
+        if SequenceAnalyzer.uses_linearfold(len(sequence)):
+            return SequenceAnalyzer.run_linearfold(sequence)
         cached = cache_manager.rnafold_cache.get(sequence)
         if cached is not None:
             return cached
         try:
-            fc = RNA.fold_compound(sequence)
-            result = fc.mfe()
+            result = SequenceAnalyzer._fold(sequence)
             cache_manager.rnafold_cache.set(sequence, result)
             return result
         except (RuntimeError, ValueError) as e:
             logger.error(f"Error running RNAfold for sequence '{sequence}': {e}")
             return ("", 0.0)
 
+    @staticmethod
+    def _fold(sequence: str) -> Tuple[str, float]:
+        """Fold a sequence with RNAfold, without any caching.
+        
+        Args:
+            sequence: RNA sequence string
+            
+        Returns:
+            Tuple of (structure, mfe) where structure is dot-bracket notation
+            
+        Raises:
+            RuntimeError, ValueError: If ViennaRNA rejects the sequence
+        """
+        structure, mfe = RNA.fold_compound(sequence, SequenceAnalyzer.fold_model()).mfe()
+        return structure, mfe
+
     @staticmethod
     @lru_cache(maxsize=100000)
+    def fold_cached(sequence: str) -> Tuple[str, float]:
+        """Fold a sequence with RNAfold, memoized in memory for this process.
+        
+        Unlike run_rnafold this never touches the persistent cache, which
+        suits the mutator's hot loop over many short-lived candidates.
+        
+        Args:
+            sequence: RNA sequence string
+            
+        Returns:
+            Tuple of (structure, mfe) where structure is dot-bracket notation
+            
+        Raises:
+            RuntimeError, ValueError: If ViennaRNA rejects the sequence
+        """
+        return SequenceAnalyzer._fold(sequence)
+
+    @staticmethod
+    def fold_many(sequences: List[str]) -> List[Tuple[str, float]]:
+        """Run RNAfold on many sequences in parallel.
+        
+        Each distinct sequence is folded at most once, and sequences already
+        in the fold cache are answered directly without being sent to the
+        worker pool. New RNAfold results are written to the cache here, since
+        workers only read it. Sequences for which uses_linearfold holds are
+        folded together by a single LinearFold process.
+        
+        Args:
+            sequences: List of RNA sequence strings
+            
+        Returns:
+            List of (structure, mfe) tuples in input order
+        """
+        results = {}
+        pending = []
+        long_pending = []
+        for seq in dict.fromkeys(sequences):
+            if SequenceAnalyzer.uses_linearfold(len(seq)):
+                long_pending.append(seq)
+                continue
+            cached = cache_manager.rnafold_cache.get(seq)
+            if cached is not None:
+                results[seq] = cached
+            else:
+                pending.append(seq)
+
+        if long_pending:
+            results.update(zip(long_pending, SequenceAnalyzer.run_linearfold_batch(long_pending)))
+
+        if pending:
+            n_cores = Config.NUM_CORES or ParallelProcessor.get_available_cores()
+            folded = ParallelProcessor.parallel_map(
+                SequenceAnalyzer.run_rnafold, pending,
+                chunksize=max(1, len(pending) // (n_cores * 4))
+            )
+            results.update(zip(pending, folded))
+            cache_manager.rnafold_cache.set_many(
+                (seq, result) for seq, result in zip(pending, folded) if result[0]
+            )
+
+        return [results[seq] for seq in sequences]
+
+    @staticmethod
+    def evaluate_structure(sequence: str, structure: str) -> float:
+        """Free energy of a given structure on a sequence, without folding.
+        
+        Energy evaluation is linear in sequence length, unlike the cubic MFE
+        fold, so it is a cheap way to test a candidate against a known
+        structure. Uses the same energy parameters as the folds.
+        
+        Args:
+            sequence: RNA sequence string
+            structure: Structure in dot-bracket notation
+            
+        Returns:
+            Free energy in kcal/mol
+        """
+        # Loads Config.ENERGY_PARAMETER_FILE if this process has not yet
+        SequenceAnalyzer.fold_model()
+        return RNA.eval_structure_simple(sequence, structure)
+
+    @staticmethod
+    def run_linearfold(sequence: str) -> Tuple[str, float]:
+        """Run LinearFold to get secondary structure and MFE in linear time.
+        
+        Uses LinearFold's ViennaRNA energy model so results are comparable
+        with run_rnafold. Falls back to run_rnafold if the LinearFold
+        executable is not available. Successful folds are memoized for this
+        process; failures are not, so a transient error is retried.
+        
+        Args:
+            sequence: RNA sequence string
+            
+        Returns:
+            Tuple of (structure, mfe) where structure is dot-bracket notation
+        """
+        if not _linearfold_available():
+            return SequenceAnalyzer.run_rnafold(sequence)
+        try:
+            return SequenceAnalyzer._linearfold_cached(sequence)
+        except (OSError, subprocess.CalledProcessError, ValueError, IndexError) as e:
+            logger.error(f"Error running LinearFold for sequence '{sequence}': {e}")
+            return ("", 0.0)
+
+    @staticmethod
+    @lru_cache(maxsize=100000)
+    def _linearfold_cached(sequence: str) -> Tuple[str, float]:
+        """Fold one sequence with LinearFold, memoized in memory for this process.
+        
+        Raises:
+            OSError, subprocess.CalledProcessError, ValueError, IndexError:
+                If LinearFold fails or its output cannot be parsed
+        """
+        proc = subprocess.run(
+            [Config.LINEARFOLD_BINARY, "-V"],
+            input=sequence.replace("T", "U") + "\n",
+            capture_output=True, text=True, check=True
+        )
+        structure, energy = proc.stdout.strip().splitlines()[-1].rsplit(" ", 1)
+        return structure, float(energy.strip("()"))
+
+    @staticmethod
+    def run_linearfold_batch(sequences: List[str]) -> List[Tuple[str, float]]:
+        """Fold many sequences with one LinearFold process.
+        
+        LinearFold reads one sequence per line, so a whole batch is piped to
+        a single invocation instead of starting a process per sequence.
+        Falls back to run_linearfold per sequence if the batch fails.
+        
+        Args:
+            sequences: List of RNA sequence strings
+            
+        Returns:
+            List of (structure, mfe) tuples in input order
+        """
+        if not sequences:
+            return []
+        if not _linearfold_available():
+            return [SequenceAnalyzer.run_linearfold(seq) for seq in sequences]
+        try:
+            proc = subprocess.run(
+                [Config.LINEARFOLD_BINARY, "-V"],
+                input="\n".join(seq.replace("T", "U") for seq in sequences) + "\n",
+                capture_output=True, text=True, check=True
+            )
+            # Each sequence is echoed back, followed by "structure (energy)"
+            lines = proc.stdout.strip().splitlines()[1::2]
+            if len(lines) != len(sequences):
+                raise ValueError(f"expected {len(sequences)} structures, got {len(lines)}")
+            results = []
+            for line in lines:
+                structure, energy = line.rsplit(" ", 1)
+                results.append((structure, float(energy.strip("()"))))
+            return results
+        except (OSError, subprocess.CalledProcessError, ValueError) as e:
+            logger.error(f"Error running LinearFold on a batch of {len(sequences)} sequences: {e}")
+            return [SequenceAnalyzer.run_linearfold(seq) for seq in sequences]
+
+    @staticmethod
     def gc_content(seq: str) -> float:
         """Calculate GC content percentage of a sequence.
         
+        Counting with bytes.count is cheaper than a cache lookup, so results
+        are not cached.
+        
         Args:
-            seq: DNA/RNA sequence string
+            seq: DNA/RNA sequence string (str or ASCII bytes)
             
         Returns:
             GC content as percentage (0-100)
         """
-        cached = cache_manager.gc_content_cache.get(seq)
-        if cached is not None:
-            return cached
-        
         if not seq:
             return 0.0
-            
-        result = (sum(1 for base in seq if base in "GC") / len(seq)) * 100
-        cache_manager.gc_content_cache.set(seq, result)
-        return result
+        
+        data = seq.encode('ascii') if isinstance(seq, str) else seq
+        return ((data.count(b'G') + data.count(b'C')) / len(data)) * 100
 
     @staticmethod
     def has_homopolymer(seq: str, max_run: int = 3) -> bool:
@@ -69,13 +283,80 @@ class SequenceAnalyzer:
         """
         if not seq:
             return False
+        return bool(kernels.has_run_longer_than(kernels.as_codes(seq), max_run))
+
+    @staticmethod
+    def gc_content_batch(codes: np.ndarray) -> np.ndarray:
+        """Vectorized gc_content over the rows of an encoded sequence array.
+        
+        Args:
+            codes: uint8 array of shape (n_sequences, sequence_length), as
+                returned by encode_sequences
             
-        count = 1
-        for i in range(1, len(seq)):
-            count = count + 1 if seq[i] == seq[i-1] else 1
-            if count > max_run: 
-                return True
-        return False
+        Returns:
+            GC content percentage (0-100) of each row
+        """
+        if codes.shape[1] == 0:
+            return np.zeros(len(codes))
+        gc = np.count_nonzero((codes == ord('G')) | (codes == ord('C')), axis=1)
+        return (gc / codes.shape[1]) * 100
+
+    @staticmethod
+    def has_homopolymer_batch(codes: np.ndarray, max_run: int = 3) -> np.ndarray:
+        """Vectorized has_homopolymer over the rows of an encoded sequence array.
+        
+        Args:
+            codes: uint8 array of shape (n_sequences, sequence_length), as
+                returned by encode_sequences
+            max_run: Maximum allowed consecutive identical bases
+            
+        Returns:
+            Boolean array, True where a row has a run longer than max_run
+        """
+        n, L = codes.shape
+        if max_run < 1 or L <= max_run:
+            return np.full(n, max_run < 1 and L > 1)
+        # A run longer than max_run spans max_run identical neighbour pairs
+        same = codes[:, 1:] == codes[:, :-1]
+        windows = np.lib.stride_tricks.sliding_window_view(same, max_run, axis=1)
+        return windows.all(axis=2).any(axis=1)
+
+    @staticmethod
+    def encode_sequences(sequences: List[str]) -> np.ndarray:
+        """Encode equal-length sequences as a 2D array of byte codes.
+        
+        Args:
+            sequences: List of equal-length sequence strings
+            
+        Returns:
+            uint8 array of shape (n_sequences, sequence_length)
+        """
+        if not sequences:
+            return np.zeros((0, 0), dtype=np.uint8)
+        return np.frombuffer(''.join(sequences).encode('ascii'), dtype=np.uint8).reshape(len(sequences), -1)
+
+    @staticmethod
+    def hamming_matrix(sequences: List[str]) -> np.ndarray:
+        """Compute pairwise Hamming distances between equal-length sequences.
+        
+        Args:
+            sequences: List of equal-length sequence strings
+            
+        Returns:
+            int32 array of shape (n_sequences, n_sequences)
+        """
+        A = SequenceAnalyzer.encode_sequences(sequences)
+        if kernels.NUMBA_AVAILABLE:
+            return kernels.hamming_matrix(A)
+        if bitpack.WORD_POPCOUNT and bitpack.is_lossless(''.join(sequences)):
+            # 32 bases per uint64 word, so far less data per comparison
+            return bitpack.hamming_matrix(bitpack.pack_rows(A), PAIRWISE_BLOCK_ROWS)
+        n = len(A)
+        dist = np.empty((n, n), dtype=np.int32)
+        for start in range(0, n, PAIRWISE_BLOCK_ROWS):
+            block = A[start:start + PAIRWISE_BLOCK_ROWS]
+            dist[start:start + len(block)] = (block[:, None, :] != A[None, :, :]).sum(axis=-1, dtype=np.int32)
+        return dist
 
     @staticmethod
     def longest_common_substring(s1: str, s2: str) -> int:
@@ -90,16 +371,52 @@ class SequenceAnalyzer:
         """
         if not s1 or not s2:
             return 0
+        if not kernels.NUMBA_AVAILABLE and bitpack.is_lossless(s1 + s2):
+            return bitpack.lcs_length(bitpack.pack(s1), len(s1), bitpack.pack(s2), len(s2))
+        return int(kernels.lcs_length(kernels.as_codes(s1), kernels.as_codes(s2)))
+
+    @staticmethod
+    def lcs_matrix(sequences: List[str]) -> np.ndarray:
+        """Compute pairwise longest common substring lengths.
+        
+        Two sequences share a substring of length k exactly when their sets
+        of length-k substrings intersect, and this holds for every shorter
+        length too, so each pair binary-searches k with set intersections.
+        Substring sets are built once per sequence and length. With Numba
+        installed the pairs are scanned by a parallel compiled kernel instead.
+        
+        Args:
+            sequences: List of sequence strings
             
-        m, n = len(s1), len(s2)
-        dp = [[0]*(n+1) for _ in range(m+1)]
-        max_len = 0
-        for i in range(m):
-            for j in range(n):
-                if s1[i] == s2[j]:
-                    dp[i+1][j+1] = dp[i][j] + 1
-                    max_len = max(max_len, dp[i+1][j+1])
-        return max_len
+        Returns:
+            Symmetric int32 array of shape (n_sequences, n_sequences); the
+            diagonal holds each sequence's own length
+        """
+        if kernels.NUMBA_AVAILABLE:
+            return kernels.lcs_matrix(*kernels.pad_codes(sequences))
+
+        n = len(sequences)
+        lcs = np.zeros((n, n), dtype=np.int32)
+        substrings = {}
+
+        def kmers(i, k):
+            if (i, k) not in substrings:
+                seq = sequences[i]
+                substrings[(i, k)] = {seq[p:p + k] for p in range(len(seq) - k + 1)}
+            return substrings[(i, k)]
+
+        for i in range(n):
+            lcs[i, i] = len(sequences[i])
+            for j in range(i + 1, n):
+                lo, hi = 0, min(len(sequences[i]), len(sequences[j]))
+                while lo < hi:
+                    k = (lo + hi + 1) // 2
+                    if kmers(i, k).isdisjoint(kmers(j, k)):
+                        hi = k - 1
+                    else:
+                        lo = k
+                lcs[i, j] = lcs[j, i] = lo
+        return lcs
 
     @staticmethod
     def structure_confidence(seq: str, target_structure: str) -> Tuple[float, float]:
@@ -112,15 +429,75 @@ class SequenceAnalyzer:
         Returns:
             Tuple of (probability, diversity)
         """
+        key = f"{seq}|{target_structure}"
+        cached = cache_manager.structure_confidence_cache.get(key)
+        if cached is not None:
+            return cached
         try:
-            fc = RNA.fold_compound(seq)
+            fc = RNA.fold_compound(seq, SequenceAnalyzer.fold_model())
             fc.pf()
             try:
                 prob = fc.pr_structure(target_structure)
             except RuntimeError:
                 prob = 0.0
             diversity = fc.mean_bp_distance()
+            cache_manager.structure_confidence_cache.set(key, (prob, diversity))
             return prob, diversity
         except (RuntimeError, ValueError) as e:
             logger.error(f"Error calculating structure confidence for sequence '{seq}': {e}")
-            return 0.0, 0.0
\ No newline at end of file
+            return 0.0, 0.0
+
+    @staticmethod
+    def structure_confidence_batch(sequences: List[str], target_structure: str) -> List[Tuple[float, float]]:
+        """Calculate structure probability and diversity for many sequences in parallel.
+        
+        Partition functions are only computed for distinct sequences that are
+        not already in the structure confidence cache, and new results are
+        written to the cache here, since workers only read it.
+        
+        Args:
+            sequences: List of RNA sequence strings
+            target_structure: Target structure in dot-bracket notation
+            
+        Returns:
+            List of (probability, diversity) tuples in input order
+        """
+        results = {}
+        pending = []
+        for seq in dict.fromkeys(sequences):
+            cached = cache_manager.structure_confidence_cache.get(f"{seq}|{target_structure}")
+            if cached is not None:
+                results[seq] = cached
+            else:
+                pending.append(seq)
+
+        if pending:
+            n_cores = Config.NUM_CORES or ParallelProcessor.get_available_cores()
+            computed = ParallelProcessor.parallel_map(
+                partial(SequenceAnalyzer.structure_confidence, target_structure=target_structure),
+                pending,
+                chunksize=max(1, len(pending) // (n_cores * 4))
+            )
+            results.update(zip(pending, computed))
+            cache_manager.structure_confidence_cache.set_many(
+                (f"{seq}|{target_structure}", result) for seq, result in zip(pending, computed)
+            )
+
+        return [results[seq] for seq in sequences]
+
+@lru_cache(maxsize=None)
+def _linearfold_available() -> bool:
+    """Check once per process whether the LinearFold executable is on PATH."""
+    if shutil.which(Config.LINEARFOLD_BINARY) is None:
+        logger.warning(f"LinearFold executable '{Config.LINEARFOLD_BINARY}' not found, using RNAfold instead")
+        return False
+    return True
+
+def _warm_up() -> None:
+    """Load the fold model, settling lazy energy parameter set-up with a throwaway fold."""
+    RNA.fold_compound('ACGU', SequenceAnalyzer.fold_model()).mfe()
+
+# Warm pool workers up front, and close cache connections before forking so
+# workers open their own
+ParallelProcessor.register_initializer(_warm_up)
+ParallelProcessor.register_prefork(cache_manager.close_all)
@@ -1,26 +1,43 @@
 import RNA
-import random
+import numpy as np
 from functools import lru_cache
 
+_BASES = np.frombuffer(b'ACGU', dtype=np.uint8)
+
+def _random_sequences(rng, count, length):
+    """`count` uniformly random ACGU sequences, drawn in one call"""
+    flat = _BASES[rng.integers(0, 4, size=count * length)].tobytes().decode('ascii')
+    return [flat[i * length:(i + 1) * length] for i in range(count)]
+
+def _default_rng():
+    """Generator seeded from the global NumPy state, so Config.set_seed applies"""
+    return np.random.default_rng(np.random.randint(0, 2**32 - 1, dtype=np.uint32))
+
 class InverseFolding:
     @staticmethod
     @lru_cache(maxsize=100)  # Cache frequent structures
     def generate(target_structure, num_variants, max_attempts=10000):
+        # Returns a tuple so cached results cannot be mutated by callers
+        rng = _default_rng()
         variants = set()
-        while len(variants) < num_variants and len(variants) < max_attempts:
-            try:
-                # Generate with random seed
-                seed = "".join(random.choice("ACGU") for _ in range(len(target_structure)))
-                seq, _ = RNA.inverse_fold(seed, target_structure)
-                variants.add(seq)
-            except RuntimeError:
-                continue
-        return list(variants)
+        attempts = 0
+        while attempts < max_attempts and len(variants) < num_variants:
+            # Each attempt adds at most one variant, so drawing seeds for the
+            # variants still missing never overshoots the early exit
+            block = min(max_attempts - attempts, num_variants - len(variants))
+            for seed in _random_sequences(rng, block, len(target_structure)):
+                try:
+                    seq, _ = RNA.inverse_fold(seed, target_structure)
+                    variants.add(seq)
+                except RuntimeError:
+                    continue
+            attempts += block
+        return tuple(variants)
     
     @staticmethod
     def get_seed_sequence(target_structure):
         """Get single high-quality sequence for mutation seeding"""
         return RNA.inverse_fold(
-            "".join(random.choice("ACGU") for _ in range(len(target_structure))),
+            _random_sequences(_default_rng(), 1, len(target_structure))[0],
             target_structure
-        )[0]
\ No newline at end of file
+        )[0]
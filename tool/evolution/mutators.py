@@ -1,13 +1,31 @@
 import logging
-from typing import List, Optional, Tuple, Any
+from typing import Any, Callable, List, Optional, Tuple
 import numpy as np
-import random
 import RNA
+from functools import lru_cache, partial
 from tool.config import Config
+from tool.core.sequence_analysis import SequenceAnalyzer
 from tool.utils.parallel import ParallelProcessor
 
 logger = logging.getLogger(__name__)
 
+# Candidates mutated and folded per worker task
+FOLD_CHUNK_SIZE = 500
+
+# Base index (A=0, C=1, G=2, T/U=3) of each ASCII code, and the ASCII codes
+# of the three other bases for each index, for mutating uint8 arrays
+_BASE_IDS = np.zeros(256, dtype=np.uint8)
+for _id, _bases in enumerate(('A', 'C', 'G', 'TU')):
+    for _base in _bases:
+        _BASE_IDS[ord(_base)] = _id
+_ALT_CODES = np.array([list(alt.encode('ascii')) for alt in ('CGU', 'AGU', 'ACU', 'ACG')],
+                      dtype=np.uint8)
+
+# Whether two base indices can form a Watson-Crick or GU wobble pair
+_PAIRABLE = np.zeros((4, 4), dtype=bool)
+for _a, _b in ('AU', 'UA', 'GC', 'CG', 'GU', 'UG'):
+    _PAIRABLE[_BASE_IDS[ord(_a)], _BASE_IDS[ord(_b)]] = True
+
 class ConservationMutator:
     """Conservation-guided RNA sequence mutator."""
     
@@ -18,6 +36,15 @@ class ConservationMutator:
             conservation_scores: List of conservation scores per position
         """
         self.conservation = conservation_scores
+        
+        # Position weights depend only on the conservation scores, so they
+        # are computed once here rather than for every candidate
+        self._mut_weights = None
+        if conservation_scores is not None:
+            tolerance = 1 - np.asarray(conservation_scores, dtype=float)
+            tolerance = np.clip(tolerance, 0.1, 1.0)
+            weights = (tolerance * Config.CONSERVATION_BIAS) + (1 - Config.CONSERVATION_BIAS)
+            self._mut_weights = weights / weights.sum()
 
     def generate(self, seed_seq: str, num_variants: int, target_structure: str, 
                 max_attempts: int = 1000000) -> List[str]:
@@ -34,10 +61,29 @@ class ConservationMutator:
         """
         # Optimized pool size based on empirical success rates
         pool_size = min(max(num_variants * 50, 5000), max_attempts)
-        args = [(seed_seq, self.conservation, target_structure) for _ in range(pool_size)]
         
         try:
-            candidates = ParallelProcessor.parallel_map(self._generate_candidate, args)
+            # One generator per call, seeded from the global NumPy state so
+            # Config.set_seed still makes runs repeatable. Each task mutates
+            # and folds one chunk of candidates from its own child seed, so
+            # workers never share a random stream and only seeds and mutation
+            # counts travel to them
+            root = np.random.SeedSequence(np.random.randint(0, 2**32 - 1, dtype=np.uint32))
+            rng = np.random.default_rng(root)
+            starts = range(0, pool_size, FOLD_CHUNK_SIZE)
+            weights = self._position_weights(len(seed_seq))
+            if Config.MUTATION_STRATEGY == "fixed":
+                mutate = _make_specialized(seed_seq, weights, Config.N_MUTATIONS)
+                rows = [min(FOLD_CHUNK_SIZE, pool_size - start) for start in starts]
+            else:
+                mutate = _make_specialized(seed_seq, weights)
+                strategy = np.array(Config.MUTATION_WEIGHTS) / sum(Config.MUTATION_WEIGHTS)
+                n_mutations = rng.choice([1, 2, 3], size=pool_size, p=strategy)
+                rows = [n_mutations[start:start + FOLD_CHUNK_SIZE] for start in starts]
+            tasks = list(zip(root.spawn(len(starts)), rows))
+            worker = partial(_generate_chunk, mutate, target_structure)
+            candidates = [cand for chunk in ParallelProcessor.parallel_map(worker, tasks, chunksize=1)
+                          for cand in chunk]
         except Exception as e:
             logger.error(f"Error in parallel variant generation: {e}")
             return []
@@ -60,83 +106,140 @@ class ConservationMutator:
             
         return variants
 
-    def _generate_candidate(self, args: Tuple[str, Optional[List[float]], str]) -> Optional[str]:
-        """Generate a single candidate variant.
+    def _position_weights(self, length: int) -> np.ndarray:
+        """Probability of choosing each position for mutation.
         
         Args:
-            args: Tuple of (seed_seq, conservation, target_structure)
+            length: Sequence length
             
         Returns:
-            Generated sequence if valid, None otherwise
+            Normalized weights, favouring less conserved positions; uniform
+            when no conservation scores were given or they do not cover
+            exactly this many positions
         """
-        seed_seq, conservation, target_structure = args
-        
-        try:
-            if Config.MUTATION_STRATEGY == "fixed":
-                n_mutations = Config.N_MUTATIONS
-            else:
-                weights = np.array(Config.MUTATION_WEIGHTS) / sum(Config.MUTATION_WEIGHTS)
-                n_mutations = np.random.choice([1, 2, 3], p=weights)
-                
-            mutated = self._mutate_with_bias(seed_seq, n_mutations=n_mutations)
-            struct, _ = RNA.fold(mutated)
-            
-            if struct == target_structure:
-                return mutated
-            return None
-        except Exception as e:
-            logger.debug(f"Error generating candidate: {e}")
-            return None
+        if self._mut_weights is not None:
+            if len(self._mut_weights) == length:
+                return self._mut_weights
+            logger.error(f"Conservation scores cover {len(self._mut_weights)} positions "
+                         f"but the sequence has {length}; falling back to random mutation")
+        return np.ones(length) / length
 
-    def _mutate_with_bias(self, seq: str, n_mutations: int = 20) -> str:
-        """Mutate sequence with conservation bias.
-        
-        Args:
-            seq: Input sequence
-            n_mutations: Number of mutations to perform
-            
-        Returns:
-            Mutated sequence
-        """
-        if not seq:
-            return seq
-            
-        seq = list(seq)
-        positions = range(len(seq))
-        
-        # Optimize mutation strategy based on sequence length
-        if len(seq) <= 30:
-            # For short sequences, use fewer mutations
-            n_mutations = min(n_mutations, len(seq) // 3)
-        else:
-            # For longer sequences, use conservation bias
-            n_mutations = min(n_mutations, len(seq) // 4)
+@lru_cache(maxsize=16)
+def _pair_indices(target_structure: str) -> Tuple[np.ndarray, np.ndarray]:
+    """0-based positions (i, j) of the base pairs in a dot-bracket structure."""
+    pt = np.array(RNA.ptable(target_structure), dtype=np.intp)
+    i = np.nonzero(pt[1:] > np.arange(1, len(pt)))[0]
+    return i, pt[i + 1] - 1
+
+def _can_form_pairs(codes: np.ndarray, target_structure: str) -> np.ndarray:
+    """Rows of an (n, L) ASCII code array able to form every base pair of the target.
+    
+    A sequence with a non-canonical base at both ends of a target pair can
+    never fold into the target, so such candidates need no fold.
+    """
+    if codes.shape[1] != len(target_structure):
+        return np.zeros(len(codes), dtype=bool)
+    i, j = _pair_indices(target_structure)
+    ids = _BASE_IDS[codes]
+    return _PAIRABLE[ids[:, i], ids[:, j]].all(axis=1)
+
+def _folds_into(seq: str, target_structure: str) -> bool:
+    """Check whether a sequence's RNAfold MFE structure is the target structure."""
+    try:
+        struct, _ = SequenceAnalyzer.fold_cached(seq)
+    except Exception as e:
+        logger.debug(f"Error folding candidate: {e}")
+        return False
+    return struct == target_structure
+
+def _make_specialized(seed_seq: str, weights: np.ndarray, n_mutations: Optional[int] = None) -> Callable:
+    """Bind everything that is fixed for one generate call into a batch mutator.
+    
+    The seed's base indices, the log position weights and the mutation cap
+    are computed once. With a fixed mutation count every row takes the same
+    number of positions, so the per-row count handling is skipped entirely.
+    The result is a partial over a module-level function, so it pickles to
+    pool workers.
+    
+    Args:
+        seed_seq: Starting sequence
+        weights: Position weights from ConservationMutator._position_weights
+        n_mutations: Mutation count shared by all candidates, or None if it
+            is given per candidate
         
-        weights = np.ones(len(seq)) / len(seq)
+    Returns:
+        Callable (rng, rows) -> uint8 array of ASCII codes, where rows is the
+        number of candidates for a fixed count, otherwise the array of
+        per-candidate counts
+    """
+    seed = np.frombuffer(seed_seq.encode('ascii'), dtype=np.uint8)
+    L = len(seed)
+    # Fewer mutations for short sequences: at most a third, otherwise a quarter
+    cap = L // 3 if L <= 30 else L // 4
+    with np.errstate(divide='ignore'):
+        log_weights = np.log(weights)
+    seed_ids = _BASE_IDS[seed]
+    if n_mutations is not None:
+        return partial(_mutate_fixed, seed, seed_ids, log_weights, min(n_mutations, cap))
+    return partial(_mutate_variable, seed, seed_ids, log_weights, cap)
+
+def _mutate_fixed(seed: np.ndarray, seed_ids: np.ndarray, log_weights: np.ndarray,
+                  n: int, rng, rows: int) -> np.ndarray:
+    """Batch mutation with the same number of mutated positions in every row."""
+    batch = np.tile(seed, (rows, 1))
+    if n <= 0:
+        return batch
+    # Gumbel-top-k: the n largest Gumbel-perturbed log weights of a row are
+    # a weighted sample of n positions without replacement
+    keys = log_weights + rng.gumbel(size=batch.shape)
+    positions = np.argpartition(-keys, n - 1, axis=1)[:, :n]
+    batch[np.arange(rows)[:, None], positions] = _ALT_CODES[seed_ids[positions], rng.integers(0, 3, size=positions.shape)]
+    return batch
+
+def _mutate_variable(seed: np.ndarray, seed_ids: np.ndarray, log_weights: np.ndarray,
+                     cap: int, rng, n_mutations: np.ndarray) -> np.ndarray:
+    """Batch mutation with a separate number of mutated positions per row."""
+    batch = np.tile(seed, (len(n_mutations), 1))
+    n_mutations = np.minimum(n_mutations, cap)
+    n_max = int(n_mutations.max()) if len(n_mutations) else 0
+    if n_max <= 0:
+        return batch
+    
+    # Gumbel-top-k as in _mutate_fixed. Each row's n_max best keys are
+    # sorted so any shorter prefix is a valid sample too.
+    keys = log_weights + rng.gumbel(size=batch.shape)
+    top = np.argpartition(-keys, n_max - 1, axis=1)[:, :n_max]
+    top = np.take_along_axis(top, np.argsort(-np.take_along_axis(keys, top, axis=1), axis=1), axis=1)
+    rows, ranks = np.nonzero(np.arange(n_max) < n_mutations[:, None])
+    positions = top[rows, ranks]
+    batch[rows, positions] = _ALT_CODES[seed_ids[positions], rng.integers(0, 3, size=len(positions))]
+    return batch
+
+def _generate_chunk(mutate: Callable, target_structure: str,
+                    task: Tuple[np.random.SeedSequence, Any]) -> List[Optional[str]]:
+    """Mutate and fold one chunk of candidates inside a worker.
+    
+    Args:
+        mutate: Batch mutator from _make_specialized
+        target_structure: Target secondary structure
+        task: Tuple of (chunk seed sequence, rows argument for mutate)
         
-        if self.conservation is not None:
-            tolerance = 1 - np.array(self.conservation)
-            tolerance = np.clip(tolerance, 0.1, 1.0)
-            weights = (tolerance * Config.CONSERVATION_BIAS) + (np.ones(len(seq)) * (1 - Config.CONSERVATION_BIAS))
-            weights /= weights.sum()
-            
-        try:
-            mut_positions = np.random.choice(positions, size=n_mutations, replace=False, p=weights)
-            for pos in mut_positions:
-                # Optimize base choice for better structure compatibility
-                current_base = seq[pos]
-                alternatives = [b for b in 'ACGU' if b != current_base]
-                
-                # Prefer GC pairs for better structure stability
-                if current_base in 'AU':
-                    alternatives = ['G', 'C'] + [b for b in alternatives if b not in ['G', 'C']]
-                
-                seq[pos] = random.choice(alternatives)
-        except ValueError as e:
-            logger.error(f"Error in biased mutation: {e}")
-            # Fallback to random mutation
-            for _ in range(n_mutations):
-                pos = random.randint(0, len(seq) - 1)
-                seq[pos] = random.choice([b for b in 'ACGU' if b != seq[pos]])
-                
-        return ''.join(seq)
\ No newline at end of file
+    Returns:
+        Each candidate if it folds into the target, None otherwise
+    """
+    chunk_seed, rows = task
+    codes = mutate(np.random.default_rng(chunk_seed), rows)
+    flat = codes.tobytes().decode('ascii')
+    L = codes.shape[1]
+    sequences = [flat[i * L:(i + 1) * L] for i in range(len(codes))]
+    pairable = _can_form_pairs(codes, target_structure)
+    if SequenceAnalyzer.uses_linearfold(L):
+        # Long candidates are folded with LinearFold, as run_rnafold would,
+        # in one process for the whole chunk
+        candidates = list(dict.fromkeys(seq for seq, ok in zip(sequences, pairable) if ok))
+        folded = dict(zip(candidates, SequenceAnalyzer.run_linearfold_batch(candidates)))
+        return [seq if ok and folded[seq][0] == target_structure else None
+                for seq, ok in zip(sequences, pairable)]
+    return [seq if ok and _folds_into(seq, target_structure) else None
+            for seq, ok in zip(sequences, pairable)]
+
@@ -9,7 +9,7 @@ class VariantGenerator:
         
     def generate(self, target_structure, num_variants):
         if self._use_inverse_folding(target_structure):
-            return self.inverse_folder.generate(target_structure, num_variants)
+            return list(self.inverse_folder.generate(target_structure, num_variants))
         else:
             return self._generate_with_conservation(target_structure, num_variants)
     
@@ -93,11 +93,14 @@ def main() -> None:
 
     # --- Group generation and further analysis ---
     try:
+        # Shared by group generation and the Hamming heatmap
+        dist_matrix = SequenceAnalyzer.hamming_matrix(final_variants)
         groups = GroupGenerator.generate_diverse_groups(
             final_variants, 
             Config.GROUP_SIZE, 
             Config.N_GROUPS,
-            Config.WILD_TYPE_SCAFFOLD
+            Config.WILD_TYPE_SCAFFOLD,
+            dist_matrix=dist_matrix
         )
         
         FileHandler.save_to_fasta(final_variants, "output/variants.fasta")
@@ -108,7 +111,7 @@ def main() -> None:
             final_variants, 
             "output/variants_heatmap.png"
         )
-        PlotGenerator.plot_hamming_heatmap(final_variants, "output/hamming_heatmap.png")
+        PlotGenerator.plot_hamming_heatmap(final_variants, "output/hamming_heatmap.png", matrix=dist_matrix)
         PlotGenerator.plot_lmax_heatmap(final_variants, "output/lmax_heatmap.png")
         
         mean_intra, mean_inter = DiversityAnalyzer.compute_group_diversity(groups)
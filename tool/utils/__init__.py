@@ -1,10 +1,12 @@
 """
 Utility functions for RNA variant design system.
 
-Includes file I/O operations and parallel processing utilities.
+Includes file I/O operations, parallel processing utilities and a suffix
+automaton for shared-substring queries.
 """
 
 from .file_io import FileHandler
 from .parallel import ParallelProcessor
+from .suffix_automaton import SuffixAutomaton
 
-__all__ = ['FileHandler', 'ParallelProcessor']
\ No newline at end of file
+__all__ = ['FileHandler', 'ParallelProcessor', 'SuffixAutomaton']
\ No newline at end of file
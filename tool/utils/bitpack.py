@@ -0,0 +1,139 @@
+"""
+2-bit packing of nucleotide sequences.
+
+A sequence is packed into a single Python int with two bits per base
+(A=0, C=1, G=2, T/U=3), first base in the lowest bits. Bitwise operations
+on the packed value then examine every base at once, without a per-character
+Python loop. T and U share a code.
+
+Arrays of sequences are packed the same way into rows of uint64 words, 32
+bases per word, for vectorized comparisons with NumPy.
+"""
+
+import numpy as np
+
+# Vectorized popcount needs NumPy >= 2.0
+WORD_POPCOUNT = hasattr(np, 'bitwise_count')
+
+_TO_DIGITS = str.maketrans('ACGTU', '01233')
+_CODES = {'A': 0, 'C': 1, 'G': 2, 'T': 3, 'U': 3}
+
+_CODE_OF_BYTE = np.zeros(256, dtype=np.uint64)
+for _base, _code in _CODES.items():
+    _CODE_OF_BYTE[ord(_base)] = _code
+_LANE_SHIFTS = np.arange(0, 64, 2, dtype=np.uint64)
+_LOW_LANE_BITS = np.uint64(0x5555555555555555)
+
+_RNA = frozenset('ACGU')
+_DNA = frozenset('ACGT')
+
+try:
+    _popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def _popcount(value):
+        return bin(value).count('1')
+
+
+def is_lossless(text: str) -> bool:
+    """Check that packing keeps every distinction between the characters of text.
+
+    T and U share a code, so text must use only ACGU or only ACGT.
+    """
+    chars = set(text)
+    return chars <= _RNA or chars <= _DNA
+
+
+def pack(seq: str) -> int:
+    """Pack a sequence into an int, two bits per base."""
+    if not seq:
+        return 0
+    return int(seq.translate(_TO_DIGITS)[::-1], 4)
+
+
+def lane_mask(length: int) -> int:
+    """Mask with the low bit of each of the first `length` 2-bit lanes set."""
+    return int('01' * length, 2) if length > 0 else 0
+
+
+def substitute(packed: int, pos: int, base: str) -> int:
+    """Return a packed sequence with the base at `pos` replaced."""
+    shift = 2 * pos
+    return packed ^ ((((packed >> shift) & 3) ^ _CODES[base]) << shift)
+
+
+def gc_count(packed: int, length: int) -> int:
+    """Count G and C bases (codes 01 and 10, i.e. lanes whose two bits differ)."""
+    return _popcount((packed ^ (packed >> 1)) & lane_mask(length))
+
+
+def has_homopolymer(packed: int, length: int, max_run: int = 3) -> bool:
+    """Check for runs of identical bases longer than max_run."""
+    if max_run < 1:
+        return length > 1
+    # One bit per adjacent pair of bases that are identical
+    diff = packed ^ (packed >> 2)
+    same = ~(diff | (diff >> 1)) & lane_mask(length - 1)
+    # A run longer than max_run needs max_run consecutive identical pairs
+    run = same
+    for k in range(1, max_run):
+        run &= same >> (2 * k)
+    return run != 0
+
+
+def hamming(a: int, b: int, length: int) -> int:
+    """Number of positions at which two packed sequences differ."""
+    x = a ^ b
+    return _popcount((x | (x >> 1)) & lane_mask(length))
+
+
+def lcs_length(a: int, len_a: int, b: int, len_b: int) -> int:
+    """Length of the longest common substring of two packed sequences.
+
+    Each relative offset of the two sequences gives one mask with a bit per
+    aligned position whose bases are equal. AND-ing every mask with itself
+    shifted one lane at a time shortens all runs by one, so the number of
+    rounds until every mask is empty is the longest run.
+    """
+    lanes = lane_mask(len_a + len_b)
+    masks = []
+    for offset in range(1 - len_b, len_a):
+        if offset >= 0:
+            x = a ^ (b << (2 * offset))
+            lo, hi = offset, min(len_a, offset + len_b)
+        else:
+            x = (a << (-2 * offset)) ^ b
+            lo, hi = -offset, min(len_b, len_a - offset)
+        # Keep only the lanes where both sequences are present
+        same = ~(x | (x >> 1)) & lanes & ((1 << (2 * hi)) - (1 << (2 * lo)))
+        if same:
+            masks.append(same)
+    best = 0
+    while masks:
+        best += 1
+        masks = [m for m in (m & (m >> 2) for m in masks) if m]
+    return best
+
+
+def pack_rows(codes: np.ndarray) -> np.ndarray:
+    """Pack an (n, L) array of ASCII codes into (n, ceil(L / 32)) uint64 words."""
+    n, L = codes.shape
+    words = -(-L // 32)
+    lanes = np.zeros((n, words * 32), dtype=np.uint64)
+    lanes[:, :L] = _CODE_OF_BYTE[codes]
+    return np.bitwise_or.reduce(lanes.reshape(n, words, 32) << _LANE_SHIFTS, axis=2)
+
+
+def hamming_matrix(words: np.ndarray, block_rows: int = 256) -> np.ndarray:
+    """Pairwise Hamming distances between rows packed by pack_rows.
+
+    Requires NumPy >= 2.0 (see WORD_POPCOUNT). Padding lanes are zero in
+    every row, so they never count as differences.
+    """
+    n = len(words)
+    dist = np.empty((n, n), dtype=np.int32)
+    for start in range(0, n, block_rows):
+        x = words[start:start + block_rows, None, :] ^ words[None, :, :]
+        diff = (x | (x >> np.uint64(1))) & _LOW_LANE_BITS
+        dist[start:start + len(x)] = np.bitwise_count(diff).sum(axis=2, dtype=np.int32)
+    return dist
+
@@ -1,34 +1,168 @@
+import hashlib
+import logging
+import os
 import pickle
+import sqlite3
+from functools import lru_cache
 from pathlib import Path
-import atexit
+from tool.config import Config
+from tool.utils.parallel import ParallelProcessor
+
+logger = logging.getLogger(__name__)
 
 class SequenceCache:
-    def __init__(self, cache_file):
+    """
+    Persistent key-value cache backed by SQLite.
+
+    Entries are written through to disk as they are added, and lookups are
+    served from an in-process dict before touching the database. Each process
+    opens its own connection on first use, so pool workers share the cache
+    file without sharing a connection. Pool workers open it read-only and keep
+    their new entries in memory; the process that owns the pool persists
+    their results with set_many.
+    """
+
+    def __init__(self, cache_file, legacy_file=None):
         self.cache_file = Path(cache_file)
-        self.cache = self._load_cache()
-        
-    def _load_cache(self):
-        if self.cache_file.exists():
-            try:
-                with open(self.cache_file, 'rb') as f:
-                    return pickle.load(f)
-            except (pickle.PickleError, EOFError):
-                return {}
-        return {}
-    
-    def save(self):
-        with open(self.cache_file, 'wb') as f:
-            pickle.dump(self.cache, f)
-            
+        self.legacy_file = Path(legacy_file) if legacy_file else None
+        self.cache = {}
+        self._conn = None
+        self._pid = None
+
+    @staticmethod
+    def _read_only():
+        """Whether this process is a pool worker; those leave writes to the pool's owner."""
+        return ParallelProcessor.is_worker()
+
+    def _connect(self):
+        if self._conn is not None and self._pid == os.getpid():
+            return self._conn
+        if self._read_only():
+            if not self.cache_file.exists():
+                return None
+            self._conn = sqlite3.connect(f"file:{self.cache_file}?mode=ro", uri=True, timeout=30)
+            self._pid = os.getpid()
+            return self._conn
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.cache_file), isolation_level=None, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB)")
+        self._conn = conn
+        self._pid = os.getpid()
+        self._import_legacy()
+        return conn
+
+    def _import_legacy(self):
+        """One-off import of a pickled cache written by earlier versions."""
+        if self.legacy_file is None or not self.legacy_file.exists():
+            return
+        if self._conn.execute("SELECT 1 FROM cache LIMIT 1").fetchone() is not None:
+            return
+        try:
+            with open(self.legacy_file, 'rb') as f:
+                legacy = pickle.load(f)
+        except (pickle.PickleError, EOFError, OSError):
+            return
+        with self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO cache (key, value) VALUES (?, ?)",
+                ((key, pickle.dumps(value)) for key, value in legacy.items())
+            )
+        logger.info(f"Imported {len(legacy)} entries from {self.legacy_file}")
+
     def get(self, key):
-        return self.cache.get(key)
-    
-    def set(self, key, value):
+        if key in self.cache:
+            return self.cache[key]
+        try:
+            conn = self._connect()
+            if conn is None:
+                return None
+            row = conn.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Cache lookup failed in {self.cache_file}: {e}")
+            return None
+        if row is None:
+            return None
+        value = pickle.loads(row[0])
         self.cache[key] = value
+        return value
+
+    def set(self, key, value):
+        self.set_many([(key, value)])
+
+    def set_many(self, items):
+        """Add (key, value) pairs, writing them to disk in one transaction."""
+        items = list(items)
+        self.cache.update(items)
+        if self._read_only() or not items:
+            return
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute("BEGIN")
+                conn.executemany(
+                    "INSERT OR REPLACE INTO cache (key, value) VALUES (?, ?)",
+                    ((key, pickle.dumps(value)) for key, value in items)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Cache write failed in {self.cache_file}: {e}")
+
+    def close(self):
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+        self._pid = None
 
 class CacheManager:
+    """
+    Holds the persistent caches. Nothing is read at construction time; each
+    cache opens its database on first access in the process that uses it.
+
+    Folds depend on the energy parameters, so each parameter set gets its
+    own database files. Only the default (Turner 2004) set imports the
+    legacy pickle, which was written with those parameters.
+    """
+
     def __init__(self):
-        self.rnafold_cache = SequenceCache("output/rnafold_cache.pkl")
-        self.gc_content_cache = SequenceCache("output/gc_content_cache.pkl")
-        atexit.register(self.rnafold_cache.save)
-        atexit.register(self.gc_content_cache.save)
\ No newline at end of file
+        self._caches = {}
+
+    @property
+    def rnafold_cache(self):
+        return self._cache("rnafold_cache", legacy_file="output/rnafold_cache.pkl")
+
+    @property
+    def structure_confidence_cache(self):
+        return self._cache("structconf_cache")
+
+    def _cache(self, name, legacy_file=None):
+        tag = _parameter_tag(Config.ENERGY_PARAMETER_FILE)
+        if (name, tag) not in self._caches:
+            if tag is None:
+                cache = SequenceCache(f"output/{name}.db", legacy_file=legacy_file)
+            else:
+                cache = SequenceCache(f"output/{name}.{tag}.db")
+            self._caches[(name, tag)] = cache
+        return self._caches[(name, tag)]
+
+    def close_all(self):
+        """Close this process's database connections, e.g. before forking workers."""
+        for cache in self._caches.values():
+            cache.close()
+
+@lru_cache(maxsize=None)
+def _parameter_tag(parameter_file):
+    """Short identifier of an energy parameter file, None for the defaults.
+    
+    Built from the file name and a digest of its contents, so editing a
+    parameter file in place also starts a fresh cache.
+    """
+    if not parameter_file:
+        return None
+    path = Path(parameter_file)
+    try:
+        digest = hashlib.sha1(path.read_bytes()).hexdigest()[:12]
+    except OSError:
+        digest = hashlib.sha1(str(path.resolve()).encode()).hexdigest()[:12]
+    return f"{path.stem}-{digest}"
@@ -1,16 +1,28 @@
 import os
+from itertools import islice
 from pathlib import Path
 
+# Records are joined and written in blocks to bound peak memory on large sets
+FASTA_WRITE_BLOCK = 10000
+
 class FileHandler:
     @staticmethod
     def save_to_fasta(sequences, filename):
-        with open(filename, "w") as f:
-            for i, seq in enumerate(sequences):
-                f.write(f">scaffold_{i}\n{seq}\n")
+        records = (f">scaffold_{i}\n{seq}\n" for i, seq in enumerate(sequences))
+        FileHandler._write_records(records, filename)
 
     @staticmethod
     def save_groups_to_fasta(groups, filename):
-        with open(filename, "w") as f:
-            for g_num, group in enumerate(groups):
-                for v_num, var in enumerate(group):
-                    f.write(f">Group{g_num+1}_Var{v_num+1}\n{var}\n")
\ No newline at end of file
+        records = (f">Group{g_num+1}_Var{v_num+1}\n{var}\n"
+                   for g_num, group in enumerate(groups)
+                   for v_num, var in enumerate(group))
+        FileHandler._write_records(records, filename)
+
+    @staticmethod
+    def _write_records(records, filename):
+        with open(filename, "w", buffering=1 << 16) as f:
+            while True:
+                block = "".join(islice(records, FASTA_WRITE_BLOCK))
+                if not block:
+                    break
+                f.write(block)
@@ -0,0 +1,117 @@
+"""
+Numeric kernels for sequence comparison.
+
+Kernels operate on byte-encoded sequences and are JIT-compiled with Numba
+when it is installed; otherwise they run as plain Python.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when Numba is not installed."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+def as_codes(seq: str):
+    """Encode a sequence for the kernels in this module.
+
+    Numba kernels take a uint8 array; the pure-Python fallback is fastest
+    on a bytes object, whose items index as ints as well.
+    """
+    data = seq.encode('ascii')
+    if NUMBA_AVAILABLE:
+        return np.frombuffer(data, dtype=np.uint8)
+    return data
+
+
+def pad_codes(sequences):
+    """Encode sequences of any length into a zero-padded (n, max_len) uint8 array.
+
+    Returns:
+        Tuple of (codes, lengths)
+    """
+    lengths = np.fromiter((len(seq) for seq in sequences), dtype=np.int64, count=len(sequences))
+    codes = np.zeros((len(sequences), lengths.max() if len(sequences) else 0), dtype=np.uint8)
+    for i, seq in enumerate(sequences):
+        codes[i, :lengths[i]] = np.frombuffer(seq.encode('ascii'), dtype=np.uint8)
+    return codes, lengths
+
+
+@njit(cache=True)
+def lcs_length(a, b):
+    """Length of the longest common substring of two encoded sequences.
+
+    Walks every diagonal of the classic DP table keeping only the current
+    run length, so no table is allocated.
+    """
+    m, n = len(a), len(b)
+    best = 0
+    for d in range(1 - m, n):
+        i = -d if d < 0 else 0
+        j = i + d
+        run = 0
+        while i < m and j < n:
+            if a[i] == b[j]:
+                run += 1
+                if run > best:
+                    best = run
+            else:
+                run = 0
+            i += 1
+            j += 1
+    return best
+
+
+@njit(cache=True)
+def has_run_longer_than(a, max_run):
+    """Check whether an encoded sequence repeats one symbol more than max_run times."""
+    count = 1
+    for i in range(1, len(a)):
+        count = count + 1 if a[i] == a[i - 1] else 1
+        if count > max_run:
+            return True
+    return False
+
+
+@njit(parallel=True, cache=True)
+def hamming_matrix(A):
+    """Pairwise Hamming distances between the rows of an (n, L) code array."""
+    n, L = A.shape
+    D = np.zeros((n, n), np.int32)
+    for i in prange(n):
+        for j in range(i + 1, n):
+            c = 0
+            for k in range(L):
+                if A[i, k] != A[j, k]:
+                    c += 1
+            D[i, j] = c
+            D[j, i] = c
+    return D
+
+
+@njit(parallel=True, cache=True)
+def lcs_matrix(A, lens):
+    """Pairwise longest common substring lengths between the rows of a padded code array.
+
+    Row i holds a sequence of length lens[i]; the diagonal gets each
+    sequence's own length.
+    """
+    n = A.shape[0]
+    D = np.zeros((n, n), np.int32)
+    for i in prange(n):
+        D[i, i] = lens[i]
+        for j in range(i + 1, n):
+            best = lcs_length(A[i, :lens[i]], A[j, :lens[j]])
+            D[i, j] = best
+            D[j, i] = best
+    return D
+
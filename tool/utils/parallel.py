@@ -1,23 +1,108 @@
+import atexit
 import logging
 import multiprocessing
+import os
 from functools import partial
 from typing import Callable, Iterable, Any, List
 from tool.config import Config
 
 logger = logging.getLogger(__name__)
 
+def _run_initializers(initializers: tuple) -> None:
+    for func in initializers:
+        func()
+
+def _worker_init(initializers: tuple) -> None:
+    """Mark this process as a pool worker and run the registered initializers."""
+    ParallelProcessor._is_worker = True
+    _run_initializers(initializers)
+
+def _get_context():
+    """Prefer fork so workers inherit already-imported modules."""
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
 class ParallelProcessor:
     """
     Handles parallel processing of tasks with configurable number of cores.
     
     Provides both map and starmap functionality with automatic core detection.
+    A single worker pool is created lazily and reused by every call, so
+    pipeline stages do not pay process start-up and import cost repeatedly.
     """
     
+    _pool = None
+    _pool_size = None
+    _pool_pid = None
+    _initializers = []
+    _prefork_hooks = []
+    _is_worker = False
+    
+    @classmethod
+    def is_worker(cls) -> bool:
+        """Whether this process is a worker of a ParallelProcessor pool."""
+        return cls._is_worker
+    
+    @classmethod
+    def register_initializer(cls, func: Callable[[], None]) -> None:
+        """
+        Register a warm-up run once in every worker before its first task.
+        
+        With fork it also runs in the parent just before the pool is created,
+        so workers inherit the loaded state. Must be picklable by reference
+        (a module-level function) for other start methods.
+        """
+        if func not in cls._initializers:
+            cls._initializers.append(func)
+    
+    @classmethod
+    def register_prefork(cls, func: Callable[[], None]) -> None:
+        """Register a hook run in the parent just before workers are forked."""
+        if func not in cls._prefork_hooks:
+            cls._prefork_hooks.append(func)
+    
     @staticmethod
     def get_available_cores() -> int:
         """Get number of available CPU cores with safety margin."""
         return max(1, multiprocessing.cpu_count() - 1)
     
+    @classmethod
+    def get_pool(cls, n_cores: int):
+        """
+        Return the shared worker pool, creating it on first use.
+        
+        Args:
+            n_cores: Number of worker processes
+            
+        Returns:
+            multiprocessing.Pool instance
+        """
+        if cls._pool is not None and cls._pool_size == n_cores and cls._pool_pid == os.getpid():
+            return cls._pool
+        cls.shutdown()
+        context = _get_context()
+        initializers = tuple(cls._initializers)
+        if context.get_start_method() == "fork":
+            # Warm up once here; forked workers inherit the loaded state
+            _run_initializers(initializers)
+            for hook in cls._prefork_hooks:
+                hook()
+        cls._pool = context.Pool(processes=n_cores, initializer=_worker_init, initargs=(initializers,))
+        cls._pool_size = n_cores
+        cls._pool_pid = os.getpid()
+        return cls._pool
+    
+    @classmethod
+    def shutdown(cls) -> None:
+        """Close the shared worker pool if this process owns one."""
+        if cls._pool is not None and cls._pool_pid == os.getpid():
+            cls._pool.close()
+            cls._pool.join()
+        cls._pool = None
+        cls._pool_size = None
+        cls._pool_pid = None
+    
     @classmethod
     def parallel_map(cls, 
                     func: Callable, 
@@ -39,8 +124,7 @@ class ParallelProcessor:
         n_cores = n_cores or Config.NUM_CORES or cls.get_available_cores()
         
         try:
-            with multiprocessing.Pool(processes=n_cores) as pool:
-                return pool.map(func, iterable, chunksize=chunksize)
+            return cls.get_pool(n_cores).map(func, iterable, chunksize=chunksize)
         except Exception as e:
             logger.error(f"Parallel map error: {e}")
             logger.info("Falling back to sequential processing")
@@ -67,8 +151,7 @@ class ParallelProcessor:
         n_cores = n_cores or Config.NUM_CORES or cls.get_available_cores()
         
         try:
-            with multiprocessing.Pool(processes=n_cores) as pool:
-                return pool.starmap(func, iterable, chunksize=chunksize)
+            return cls.get_pool(n_cores).starmap(func, iterable, chunksize=chunksize)
         except Exception as e:
             logger.error(f"Parallel starmap error: {e}")
             logger.info("Falling back to sequential processing")
@@ -96,8 +179,7 @@ class ParallelProcessor:
         partial_func = partial(cls._apply_args, func, constant_args)
         
         try:
-            with multiprocessing.Pool(processes=n_cores) as pool:
-                return pool.map(partial_func, variable_args)
+            return cls.get_pool(n_cores).map(partial_func, variable_args)
         except Exception as e:
             logger.error(f"Parallel apply error: {e}")
             logger.info("Falling back to sequential processing")
@@ -107,4 +189,6 @@ class ParallelProcessor:
     def _apply_args(func: Callable, constant_args: dict, variable_args: dict) -> Any:
         """Helper method to merge constant and variable arguments."""
         kwargs = {**constant_args, **variable_args}
-        return func(**kwargs)
\ No newline at end of file
+        return func(**kwargs)
+
+atexit.register(ParallelProcessor.shutdown)
\ No newline at end of file
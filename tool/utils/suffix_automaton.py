@@ -0,0 +1,71 @@
+"""
+Suffix automaton over a growing collection of sequences.
+
+The automaton recognizes every substring of the sequences added so far, so
+the longest substring of a query shared with any of them is found in one
+pass over the query, independent of how many sequences have been added.
+"""
+
+SEPARATOR = '$'
+
+
+class SuffixAutomaton:
+    """
+    Generalized suffix automaton supporting incremental extension.
+
+    Sequences are appended behind a separator character that never occurs in
+    queries, so no match can span two sequences.
+    """
+
+    def __init__(self):
+        self._next = [{}]
+        self._link = [-1]
+        self._len = [0]
+        self._last = 0
+
+    def extend(self, seq: str) -> None:
+        """Add a sequence so its substrings are recognized by later queries."""
+        for char in SEPARATOR + seq:
+            self._add(char)
+
+    def max_match(self, query: str) -> int:
+        """Length of the longest substring of query that occurs in an added sequence."""
+        nxt, link, length = self._next, self._link, self._len
+        state, matched, best = 0, 0, 0
+        for char in query:
+            while state and char not in nxt[state]:
+                state = link[state]
+                matched = length[state]
+            if char in nxt[state]:
+                state = nxt[state][char]
+                matched += 1
+                if matched > best:
+                    best = matched
+        return best
+
+    def _add(self, char: str) -> None:
+        nxt, link, length = self._next, self._link, self._len
+        cur = len(length)
+        nxt.append({})
+        link.append(0)
+        length.append(length[self._last] + 1)
+
+        p = self._last
+        while p != -1 and char not in nxt[p]:
+            nxt[p][char] = cur
+            p = link[p]
+        if p != -1:
+            q = nxt[p][char]
+            if length[p] + 1 == length[q]:
+                link[cur] = q
+            else:
+                clone = len(length)
+                nxt.append(dict(nxt[q]))
+                link.append(link[q])
+                length.append(length[p] + 1)
+                while p != -1 and nxt[p].get(char) == q:
+                    nxt[p][char] = clone
+                    p = link[p]
+                link[q] = clone
+                link[cur] = clone
+        self._last = cur
@@ -4,9 +4,20 @@ import numpy as np
 from matplotlib import gridspec
 import matplotlib.colors as mcolors
 import RNA 
+from functools import lru_cache
 from pathlib import Path
 from tool.config import Config
 
+@lru_cache(maxsize=64)
+def _coords(structure):
+    """naview layout of a structure as a tuple of (x, y) pairs"""
+    return tuple((c.X, c.Y) for c in RNA.naview_xy_coordinates(structure))
+
+@lru_cache(maxsize=64)
+def _ptable(structure):
+    """ViennaRNA pair table of a structure, as an immutable tuple"""
+    return tuple(RNA.ptable(structure))
+
 class ConservationVisualizer:
     """
     Handles all visualization for conservation analysis
@@ -124,8 +135,8 @@ class ConservationVisualizer:
             - Call this function with sequence, structure, and scores.
 
         """
-        # Generate coordinates using ViennaRNA's naview layout
-        coords = RNA.naview_xy_coordinates(structure)
+        # Generate coordinates using ViennaRNA's naview layout (cached per structure)
+        coords = np.array(_coords(structure))
 
         fig, ax = plt.subplots(figsize=(8, 8), dpi=400)
         norm = mcolors.Normalize(vmin=0, vmax=1)
@@ -137,30 +148,30 @@ class ConservationVisualizer:
         desaturated_cmap = mcolors.ListedColormap(desaturated_colors)
 
         # Draw bonds between paired bases
-        pt = RNA.ptable(structure)
+        pt = _ptable(structure)
         pairs = [(i, pt[i]) for i in range(1, len(pt)) if pt[i] > i]
         for i, j in pairs:
             ax.plot(
-                [coords[i-1].X, coords[j-1].X],
-                [coords[i-1].Y, coords[j-1].Y],
+                [coords[i-1, 0], coords[j-1, 0]],
+                [coords[i-1, 1], coords[j-1, 1]],
                 color='#A0A0A0', lw=0.7, zorder=1
             )
 
         # Draw backbone as a sequential line connecting each nucleotide (drawn underneath bonds and nucleotides)
         ax.plot(
-            [coords[i].X for i in range(len(sequence))],
-            [coords[i].Y for i in range(len(sequence))],
+            coords[:len(sequence), 0],
+            coords[:len(sequence), 1],
             color='black', lw=0.5, zorder=0
         )
 
         # Draw nucleotides
         for i, base in enumerate(sequence):
             ax.scatter(
-                coords[i].X, coords[i].Y,
+                coords[i, 0], coords[i, 1],
                 c=[desaturated_cmap(norm(conservation_scores[i]))],
                 s=380, edgecolor='black', linewidth=0.6, zorder=2
             )
-            ax.text(coords[i].X, coords[i].Y, base,
+            ax.text(coords[i, 0], coords[i, 1], base,
                     ha='center', va='center', fontsize=11, fontweight='bold', zorder=3)
 
         ax.set_aspect('equal')
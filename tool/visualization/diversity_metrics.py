@@ -5,63 +5,39 @@ class DiversityAnalyzer:
     @staticmethod
     def compute_group_diversity(groups):
         all_seqs = [seq for group in groups for seq in group]
-        seq_idx = {seq: idx for idx, seq in enumerate(all_seqs)}
-        n = len(all_seqs)
-        
-        dist_matrix = np.zeros((n, n), dtype=int)
-        for i in range(n):
-            for j in range(n):
-                dist_matrix[i, j] = sum(c1 != c2 for c1, c2 in zip(all_seqs[i], all_seqs[j]))
-        
-        intra_dists = []
-        for group in groups:
-            indices = [seq_idx[seq] for seq in group]
-            for i in range(len(indices)):
-                for j in range(i+1, len(indices)):
-                    intra_dists.append(dist_matrix[indices[i], indices[j]])
-        mean_intra = np.mean(intra_dists) if intra_dists else 0
-        
-        inter_dists = []
-        for i, group1 in enumerate(groups):
-            for j, group2 in enumerate(groups):
-                if i >= j:
-                    continue
-                for s1 in group1:
-                    for s2 in group2:
-                        inter_dists.append(dist_matrix[seq_idx[s1], seq_idx[s2]])
-        mean_inter = np.mean(inter_dists) if inter_dists else 0
-        
+        dist_matrix = SequenceAnalyzer.hamming_matrix(all_seqs)
+        return DiversityAnalyzer._intra_inter_means(dist_matrix, groups)
+
+    @staticmethod
+    def _group_indices(groups):
+        """Row indices of each group's members in the flattened sequence list"""
+        bounds = np.cumsum([0] + [len(group) for group in groups])
+        return [np.arange(bounds[k], bounds[k + 1]) for k in range(len(groups))]
+
+    @staticmethod
+    def _intra_inter_means(matrix, groups):
+        """Mean of a pairwise matrix over pairs within a group and pairs across groups"""
+        indices = DiversityAnalyzer._group_indices(groups)
+
+        intra_vals = [matrix[np.ix_(idx, idx)][np.triu_indices(len(idx), k=1)] for idx in indices]
+        intra_vals = np.concatenate(intra_vals) if intra_vals else np.empty(0)
+        mean_intra = np.mean(intra_vals) if intra_vals.size else 0
+
+        inter_vals = [matrix[np.ix_(indices[i], indices[j])].ravel()
+                      for i in range(len(indices)) for j in range(i + 1, len(indices))]
+        inter_vals = np.concatenate(inter_vals) if inter_vals else np.empty(0)
+        mean_inter = np.mean(inter_vals) if inter_vals.size else 0
+
         return mean_intra, mean_inter
 
     @staticmethod
     def compute_lmax_analysis(groups):
         all_seqs = [seq for group in groups for seq in group]
-        seq_idx = {seq: i for i, seq in enumerate(all_seqs)}
-        n = len(all_seqs)
-
-        lmax_matrix = np.zeros((n, n), dtype=int)
-        for i in range(n):
-            for j in range(n):
-                if i != j:
-                    lmax_matrix[i][j] = SequenceAnalyzer.longest_common_substring(all_seqs[i], all_seqs[j])
 
-        intra_lmax_vals = []
-        for group in groups:
-            indices = [seq_idx[seq] for seq in group]
-            for i in range(len(indices)):
-                for j in range(i+1, len(indices)):
-                    intra_lmax_vals.append(lmax_matrix[indices[i]][indices[j]])
-        mean_intra_lmax = np.mean(intra_lmax_vals) if intra_lmax_vals else 0
+        lmax_matrix = SequenceAnalyzer.lcs_matrix(all_seqs)
+        np.fill_diagonal(lmax_matrix, 0)
 
-        inter_lmax_vals = []
-        for i, group1 in enumerate(groups):
-            for j, group2 in enumerate(groups):
-                if i >= j:
-                    continue
-                for s1 in group1:
-                    for s2 in group2:
-                        inter_lmax_vals.append(lmax_matrix[seq_idx[s1], seq_idx[s2]])
-        mean_inter_lmax = np.mean(inter_lmax_vals) if inter_lmax_vals else 0
+        mean_intra_lmax, mean_inter_lmax = DiversityAnalyzer._intra_inter_means(lmax_matrix, groups)
 
         per_variant_lmax = np.max(lmax_matrix, axis=1)
 
@@ -69,4 +45,4 @@ class DiversityAnalyzer:
             'mean_intra_lmax': mean_intra_lmax,
             'mean_inter_lmax': mean_inter_lmax,
             'per_variant_lmax': per_variant_lmax
-        }
\ No newline at end of file
+        }
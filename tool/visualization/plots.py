@@ -6,9 +6,12 @@ from tool.core.sequence_analysis import SequenceAnalyzer
 class PlotGenerator:
     @staticmethod
     def plot_difference_heatmap(wt_seq, variants, filename):
+        wt = SequenceAnalyzer.encode_sequences([wt_seq])[0]
+        diff = (SequenceAnalyzer.encode_sequences(variants) != wt).astype(np.uint8)
+
         plt.figure(figsize=(12,6), dpi=300)
         sns.heatmap(
-            np.array([[1 if v[i]!=wt_seq[i] else 0 for i in range(len(wt_seq))] for v in variants]),
+            diff,
             cmap="Reds", cbar=True, linewidths=0.5, linecolor='gray',
             xticklabels=list(range(1,len(wt_seq)+1)),
             yticklabels=[f"Var {i+1}" for i in range(len(variants))],
@@ -24,13 +27,10 @@ class PlotGenerator:
         plt.close()
 
     @staticmethod
-    def plot_hamming_heatmap(sequences, filename):
+    def plot_hamming_heatmap(sequences, filename, matrix=None):
         n = len(sequences)
-        matrix = np.zeros((n, n), dtype=int)
-        
-        for i in range(n):
-            for j in range(n):
-                matrix[i][j] = sum(c1 != c2 for c1, c2 in zip(sequences[i], sequences[j]))
+        if matrix is None:
+            matrix = SequenceAnalyzer.hamming_matrix(sequences)
 
         plt.figure(figsize=(10, 8), dpi=300)
         sns.heatmap(matrix, annot=True, fmt="d", cmap="coolwarm", 
@@ -48,10 +48,7 @@ class PlotGenerator:
     @staticmethod
     def plot_lmax_heatmap(sequences, filename):
         n = len(sequences)
-        matrix = np.zeros((n, n), dtype=int)
-        for i in range(n):
-            for j in range(n):
-                matrix[i][j] = SequenceAnalyzer.longest_common_substring(sequences[i], sequences[j])
+        matrix = SequenceAnalyzer.lcs_matrix(sequences)
 
         plt.figure(figsize=(10, 8), dpi=300)
         sns.heatmap(matrix, annot=True, fmt="d", cmap="YlGnBu", 